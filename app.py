@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-import re
+from plotly.subplots import make_subplots
+from io import BytesIO
 
 # ---------------------------------------------------------
 # PAGE CONFIG
@@ -12,7 +13,7 @@ st.set_page_config(page_title="RFI Dashboard", layout="wide")
 # ---------------------------------------------------------
 # CSS FOR UI
 # ---------------------------------------------------------
-st.markdown("""
+CSS = """
 <style>
 body { background-color: #F5F7FA; }
 
@@ -29,19 +30,6 @@ body { background-color: #F5F7FA; }
     font-weight: 700;
 }
 
-.badge {
-    padding: 6px 14px;
-    border-radius: 12px;
-    font-weight: 600;
-    font-size: 13px;
-    margin-right: 8px;
-    color: white;
-}
-
-.badge-green { background: #28A745; }
-.badge-red { background: #DC3545; }
-.badge-yellow { background: #FFC107; color: black; }
-
 .chip {
     display: inline-block;
     padding: 4px 12px;
@@ -51,53 +39,170 @@ body { background-color: #F5F7FA; }
     font-size: 12px;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CSS, unsafe_allow_html=True)
 
 # ---------------------------------------------------------
 # STATUS CLEANING
 # ---------------------------------------------------------
-def clean_status(x):
-    if pd.isna(x):
-        return "Not reviewed"
-    x = str(x)
-    x = re.sub(r"[^\w\s]", "", x)  # remove emojis/symbols
-    x = x.strip().lower()
-    if "closed" in x:
-        return "Closed"
-    if "review" in x:
-        return "Not reviewed"
-    return "Not reviewed"
+def clean_status(status):
+    # vectorized over the whole column; NaN falls through to "Not reviewed"
+    s = (
+        status.astype("string")
+        .str.replace(r"[^\w\s]", "", regex=True)  # remove emojis/symbols
+        .str.strip()
+        .str.lower()
+    )
+    closed = s.str.contains("closed", regex=False, na=False)
+    return pd.Series(
+        np.where(closed, "Closed", "Not reviewed"), index=status.index
+    )
 
 # ---------------------------------------------------------
-# LOAD AND FIX SHEET
+# LOAD WORKBOOK (cached on file bytes)
 # ---------------------------------------------------------
-def load_sheet(df_raw):
-    # first row is header row
-    new_header = df_raw.iloc[0]
-    df = df_raw[1:].copy()
-    df.columns = new_header
-    df = df.reset_index(drop=True)
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def load_workbook(file_bytes):
+    raw = pd.read_excel(
+        BytesIO(file_bytes), sheet_name=None, engine="calamine", header=1
+    )
+
+    # only the status column is used, so keep just that in the cache;
+    # sheets without one keep an empty frame so their rows still count
+    sheets = {}
+    for sheet_name, df in raw.items():
+        # normalize column names once per workbook, not per rerun
+        df.columns = [str(c).strip().lower() for c in df.columns]
+        sheets[sheet_name] = df[["status"] if "status" in df.columns else []]
+    return sheets
 
-    # normalize column names
-    df.columns = [str(c).strip().lower() for c in df.columns]
+# ---------------------------------------------------------
+# LOAD AND FIX SHEETS
+# ---------------------------------------------------------
+def load_statuses(sheets):
+    # header row and column names are already fixed up by load_workbook
+    columns = {}
+    for sheet_name, df in sheets.items():
+        # sheets without a status column count as not reviewed
+        if "status" in df.columns:
+            columns[sheet_name] = df["status"]
+        else:
+            columns[sheet_name] = pd.Series(np.nan, index=df.index, dtype=object)
+
+    # one column for the whole workbook, cleaned in a single pass
+    status = pd.concat(columns, names=["sheet", None])
+
+    # at most two labels, so store as int8 category codes
+    return clean_status(status).astype(
+        pd.CategoricalDtype(["Closed", "Not reviewed"])
+    )
 
-    # ensure status column exists
-    if "status" in df.columns:
-        df["status"] = df["status"].apply(clean_status)
-    else:
-        df["status"] = "Not reviewed"
+# ---------------------------------------------------------
+# STATS
+# ---------------------------------------------------------
+def compute_stats(status, sheet_names):
+    sheet = status.index.get_level_values("sheet")
+    counts = (
+        status.groupby([sheet, status], observed=False, sort=False)
+        .size()
+        .unstack(fill_value=0)
+    )
+    counts.columns = counts.columns.astype(str)
+    # empty sheets have no rows to group
+    counts = counts.reindex(
+        index=sheet_names, columns=["Closed", "Not reviewed"], fill_value=0
+    )
+
+    stats = pd.DataFrame(
+        {
+            "total": counts.sum(axis=1),
+            "closed": counts["Closed"],
+            "pending": counts["Not reviewed"],
+        }
+    )
+    stats["progress"] = (stats["closed"] / stats["total"]).fillna(0.0)
+    return stats
 
-    return df
+# ---------------------------------------------------------
+# CHARTS (one figure for all sheets, cached on their stats)
+# ---------------------------------------------------------
+def gauge_trace(sheet_name, progress):
+    return go.Indicator(
+        mode="gauge+number",
+        name=sheet_name,
+        value=progress * 100,
+        number={"suffix": "%"},
+        gauge={
+            "axis": {"range": [0, 100]},
+            "bar": {"color": "#4A90E2"},
+        },
+    )
+
+def pie_trace(sheet_name, closed, pending):
+    return go.Pie(
+        name=sheet_name,
+        title={"text": sheet_name},
+        labels=["Closed", "Not reviewed"],
+        values=[closed, pending],
+        marker={"colors": ["green", "red"]},
+        hole=0.45,
+        sort=False,
+    )
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def build_charts(sheet_stats):
+    # sheet_stats: tuple of (sheet_name, closed, pending, progress)
+    rows = len(sheet_stats)
+    titles = []
+    for sheet_name, _, _, _ in sheet_stats:
+        titles += [
+            f"{sheet_name} · Completion Gauge",
+            f"{sheet_name} · Status Breakdown",
+        ]
+
+    fig = make_subplots(
+        rows=rows,
+        cols=2,
+        specs=[[{"type": "indicator"}, {"type": "domain"}]] * rows,
+        subplot_titles=titles,
+    )
+    for row, (sheet_name, closed, pending, progress) in enumerate(
+        sheet_stats, start=1
+    ):
+        fig.add_trace(gauge_trace(sheet_name, progress), row=row, col=1)
+        fig.add_trace(pie_trace(sheet_name, closed, pending), row=row, col=2)
+
+    fig.update_layout(height=280 * rows, margin=dict(t=40, b=10, l=10, r=10))
+    return fig
 
 # ---------------------------------------------------------
-# STATS
+# SHEET CARD
 # ---------------------------------------------------------
-def compute_stats(df):
-    total = len(df)
-    closed = (df["status"] == "Closed").sum()
-    pending = (df["status"] == "Not reviewed").sum()
-    progress = closed / total if total else 0.0
-    return total, closed, pending, progress
+def render_sheet(sheet_name, total, closed, pending, progress):
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.subheader(f"📄 {sheet_name}")
+
+    # -------- COUNTS --------
+    m1, m2 = st.columns(2)
+    m1.metric("Closed", closed)
+    m2.metric("Pending", pending)
+
+    # -------- PROGRESS BAR --------
+    st.write("**Progress**")
+    st.progress(progress)
+    st.write(f"### {int(progress * 100)}%")
+
+    # -------- STATUS CHIPS --------
+    st.write("**Status values detected:**")
+    chips_html = "".join(
+        f"<span class='chip'>{label}</span>"
+        for label, count in (("Closed", closed), ("Not reviewed", pending))
+        if count
+    )
+    st.markdown(chips_html, unsafe_allow_html=True)
+
+    st.write(f"**Total RFIs:** {total}")
+    st.markdown("</div>", unsafe_allow_html=True)
 
 # ---------------------------------------------------------
 # UI HEADER
@@ -109,84 +214,30 @@ uploaded_file = st.file_uploader("Upload Excel (.xlsx)", type=["xlsx"])
 # MAIN
 # ---------------------------------------------------------
 if uploaded_file:
-    sheets = pd.read_excel(uploaded_file, sheet_name=None)
-
-    for sheet_name, df_raw in sheets.items():
-        df = load_sheet(df_raw)
-        total, closed, pending, progress = compute_stats(df)
-
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.subheader(f"📄 {sheet_name}")
-
-        # badges
-        st.markdown(
-            f"""
-            <span class='badge badge-green'>Closed: {closed}</span>
-            <span class='badge badge-red'>Pending: {pending}</span>
-            """,
-            unsafe_allow_html=True,
+    sheets = load_workbook(uploaded_file.getvalue())
+
+    status = load_statuses(sheets)
+    stats = compute_stats(status, list(sheets))
+
+    sheet_stats = [
+        (row.Index, int(row.closed), int(row.pending), float(row.progress))
+        for row in stats.itertuples()
+    ]
+
+    # -------- GAUGES + PIES (single figure, above the sheet cards) --------
+    if sheet_stats:
+        st.subheader("Completion by sheet")
+        st.plotly_chart(
+            build_charts(tuple(sheet_stats)),
+            use_container_width=True,
+            key="charts"
         )
 
-        col1, col2, col3 = st.columns([1.2, 1, 1])
-
-        # -------- PROGRESS BAR --------
-        with col1:
-            st.write("**Progress**")
-            st.progress(progress)
-            st.write(f"### {int(progress * 100)}%")
-
-        # -------- GAUGE (unique key) --------
-        with col2:
-            fig_gauge = go.Figure(
-                go.Indicator(
-                    mode="gauge+number",
-                    value=progress * 100,
-                    number={"suffix": "%"},
-                    gauge={
-                        "axis": {"range": [0, 100]},
-                        "bar": {"color": "#4A90E2"},
-                    },
-                )
-            )
-            fig_gauge.update_layout(height=250, margin=dict(t=10, b=10, l=10, r=10))
-            st.write("**Completion Gauge**")
-            st.plotly_chart(
-                fig_gauge,
-                use_container_width=True,
-                key=f"{sheet_name}_gauge"
-            )
-
-        # -------- PIE (unique key) --------
-        with col3:
-            pie_df = pd.DataFrame(
-                {
-                    "Status": ["Closed", "Not reviewed"],
-                    "Count": [closed, pending],
-                }
-            )
-            fig_pie = px.pie(
-                pie_df,
-                names="Status",
-                values="Count",
-                color="Status",
-                color_discrete_map={"Closed": "green", "Not reviewed": "red"},
-                hole=0.45,
-            )
-            fig_pie.update_layout(height=250, margin=dict(t=10, b=10, l=10, r=10))
-            st.write("**Status Breakdown**")
-            st.plotly_chart(
-                fig_pie,
-                use_container_width=True,
-                key=f"{sheet_name}_pie"
-            )
-
-        # -------- STATUS CHIPS --------
-        st.write("**Status values detected:**")
-        unique_status = df["status"].unique()
-        chips_html = "".join(
-            f"<span class='chip'>{s}</span>" for s in unique_status
+    for row in stats.itertuples():
+        render_sheet(
+            row.Index,
+            int(row.total),
+            int(row.closed),
+            int(row.pending),
+            float(row.progress),
         )
-        st.markdown(chips_html, unsafe_allow_html=True)
-
-        st.write(f"**Total RFIs:** {total}")
-        st.markdown("</div>", unsafe_allow_html=True)